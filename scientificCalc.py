@@ -1,492 +1,1039 @@
-import customtkinter as ctk
-import mpmath as mp
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
-import re
-
-# Set extremely high precision (10^31 bits)
-mp.mp.prec = 10**31
-
-# Allowed names for mpmath evaluation
-allowed_names = { 
-    "sin": mp.sin,
-    "cos": mp.cos,
-    "tan": mp.tan,
-    "log": lambda x: mp.log(x, 10),
-    "ln": mp.log,
-    "sqrt": mp.sqrt,
-    "exp": mp.exp,
-    "pi": mp.pi,
-    "e": mp.e
-}
-
-# Use transformations to support implicit multiplication (e.g., "2x" -> "2*x")
-transformations = standard_transformations + (implicit_multiplication_application,)
-
-class AdvancedScientificCalculator(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-        self.title("Extremely Advanced Scientific Calculator")
-        self.geometry("1200x900")
-        self.configure(bg_color="#1e1e1e")
-        self.attributes("-topmost", True)
-        
-        # Internal state
-        self.expression = ""
-        self.history = []
-        self.shift_mode = False
-        self.memory = 0
-        
-        # Shift mapping for digit buttons (for alternative variable insertion)
-        self.shift_mapping = {
-            "7": "x", "8": "y", "9": "z",
-            "4": "a", "5": "b", "6": "c",
-            "1": "d", "2": "e", "3": "f",
-            "0": "g"
-        }
-        self.func_map = {
-            "sin": "sin(", "cos": "cos(", "tan": "tan(",
-            "log": "log(", "ln": "ln(", "√": "sqrt(",
-            "exp": "exp(", "x^y": "^"
-        }
-        
-        # Top menu frame with advanced function buttons
-        menu_frame = ctk.CTkFrame(self, fg_color="#2e2e2e", corner_radius=10)
-        menu_frame.grid(row=0, column=0, columnspan=10, padx=10, pady=10, sticky="nsew")
-        self.diff_button = ctk.CTkButton(menu_frame, text="Differentiate", command=self.differentiate_expression, width=120)
-        self.diff_button.grid(row=0, column=0, padx=5, pady=5)
-        self.int_button = ctk.CTkButton(menu_frame, text="Integrate", command=self.integrate_expression, width=120)
-        self.int_button.grid(row=0, column=1, padx=5, pady=5)
-        self.solve_button = ctk.CTkButton(menu_frame, text="Solve Eqn", command=self.solve_equation, width=120)
-        self.solve_button.grid(row=0, column=2, padx=5, pady=5)
-        self.ode_button = ctk.CTkButton(menu_frame, text="Solve ODE", command=self.solve_ode, width=120)
-        self.ode_button.grid(row=0, column=3, padx=5, pady=5)
-        self.fourier_button = ctk.CTkButton(menu_frame, text="Fourier", command=self.fourier_transform, width=120)
-        self.fourier_button.grid(row=0, column=4, padx=5, pady=5)
-        self.latex_button = ctk.CTkButton(menu_frame, text="LaTeX Render", command=self.latex_render, width=120)
-        self.latex_button.grid(row=0, column=5, padx=5, pady=5)
-        self.matrix_button = ctk.CTkButton(menu_frame, text="Matrix Ops", command=self.matrix_operations, width=120)
-        self.matrix_button.grid(row=0, column=6, padx=5, pady=5)
-        self.mem_clear = ctk.CTkButton(menu_frame, text="MC", command=self.memory_clear, width=60)
-        self.mem_clear.grid(row=0, column=7, padx=5, pady=5)
-        self.mem_recall = ctk.CTkButton(menu_frame, text="MR", command=self.memory_recall, width=60)
-        self.mem_recall.grid(row=0, column=8, padx=5, pady=5)
-        self.mem_add = ctk.CTkButton(menu_frame, text="M+", command=self.memory_add, width=60)
-        self.mem_add.grid(row=0, column=9, padx=5, pady=5)
-        self.mem_sub = ctk.CTkButton(menu_frame, text="M-", command=self.memory_subtract, width=60)
-        self.mem_sub.grid(row=0, column=10, padx=5, pady=5)
-
-        # Editable expression entry
-        self.expr_var = ctk.StringVar(value="")
-        self.entry = ctk.CTkEntry(self, textvariable=self.expr_var, font=("Arial", 24),
-                                   justify="right", height=50)
-        self.entry.grid(row=1, column=0, columnspan=10, padx=20, pady=10, sticky="nsew")
-        self.entry.bind("<KeyRelease>", self.update_expression_from_entry)
-        
-        # Basic shift toggle button
-        self.shift_button = ctk.CTkButton(self, text="Shift Off", font=("Arial", 18),
-                                          command=self.toggle_shift, height=50)
-        self.shift_button.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
-        
-        # Basic calculator buttons layout
-        buttons = [
-            ["sin", "cos", "tan", "log"],
-            ["ln", "√", "x^y", "exp"],
-            ["7", "8", "9", "/"],
-            ["4", "5", "6", "*"],
-            ["1", "2", "3", "+"],
-            ["-", "0", ".", "("],
-            [")", "pi", "e", "C"],
-            ["=", "Del", "toDeg", "toRad"],
-            ["Graph"]
-        ]
-        row_index = 3
-        for row in buttons:
-            for col_index, btn_text in enumerate(row):
-                widget = self.create_button_widget(btn_text)
-                widget.grid(row=row_index, column=col_index, padx=5, pady=5, sticky="nsew")
-            row_index += 1
-
-        # History panel on the right
-        self.history_box = ctk.CTkTextbox(self, font=("Arial", 12))
-        self.history_box.grid(row=1, column=10, rowspan=row_index, padx=10, pady=10, sticky="nsew")
-        self.history_box.insert("0.0", "History:\n")
-        self.history_box.configure(state="disabled")
-
-        # Configure grid weights
-        for i in range(row_index+1):
-            self.grid_rowconfigure(i, weight=1)
-        for j in range(11):
-            self.grid_columnconfigure(j, weight=1)
-
-        # Bind keyboard events and Ctrl+G for graph
-        self.bind_all("<Key>", self.handle_key)
-        self.bind_all("<Control-g>", lambda event: self.graph_expression())
-
-    def update_expression_from_entry(self, event):
-        self.expression = self.expr_var.get()
-
-    def create_button_widget(self, btn_text):
-        command = lambda x=btn_text: self.click(x)
-        if btn_text in self.shift_mapping:
-            display_text = f"{btn_text} ({self.shift_mapping[btn_text]})"
-        else:
-            display_text = btn_text
-        return ctk.CTkButton(self, text=display_text, font=("Arial", 18),
-                             command=command, height=50)
-
-    def toggle_shift(self):
-        self.shift_mode = not self.shift_mode
-        self.shift_button.configure(text="Shift On" if self.shift_mode else "Shift Off")
-
-    def click(self, key):
-        if key == "=":
-            try:
-                expr = self.expression.replace('^', '**')
-                # Parse using implicit multiplication transformation for human-friendly input
-                expr_sym = parse_expr(expr, transformations=transformations)
-                result = eval(str(expr_sym), {"__builtins__": None}, allowed_names)
-                self.add_history(f"{expr} = {result}")
-                self.expression = str(result)
-            except Exception:
-                self.expression = "Error"
-            self._update_display()
-        elif key == "C":
-            self.expression = ""
-            self._update_display()
-        elif key == "Del":
-            self.expression = self.expression[:-1]
-            self._update_display()
-        elif key == "toDeg":
-            try:
-                value = mp.mpf(self.expression)
-                converted = value * 180 / mp.pi
-                self.add_history(f"toDeg({self.expression}) = {converted}")
-                self.expression = str(converted)
-            except Exception:
-                self.expression = "Error"
-            self._update_display()
-        elif key == "toRad":
-            try:
-                value = mp.mpf(self.expression)
-                converted = value * mp.pi / 180
-                self.add_history(f"toRad({self.expression}) = {converted}")
-                self.expression = str(converted)
-            except Exception:
-                self.expression = "Error"
-            self._update_display()
-        elif key == "Graph":
-            self.graph_expression()
-        else:
-            if key.isdigit() and self.shift_mode:
-                key = self.shift_mapping.get(key, key)
-            self.expression += key
-            self._update_display()
-
-    def _update_display(self):
-        self.expr_var.set(self.expression)
-
-    def add_history(self, text):
-        self.history.append(text)
-        self.history_box.configure(state="normal")
-        self.history_box.insert("end", text + "\n")
-        self.history_box.configure(state="disabled")
-        self.history_box.see("end")
-
-    def differentiate_expression(self):
-        var = "x"
-        try:
-            symbol = sp.symbols(var)
-            expr_sym = parse_expr(self.expression, transformations=transformations)
-            diff_expr = sp.diff(expr_sym, symbol)
-            result = sp.N(diff_expr)
-            self.add_history(f"d/d{var}({self.expression}) = {result}")
-            self.expression = str(result)
-        except Exception:
-            self.expression = "Error"
-        self._update_display()
-
-    def integrate_expression(self):
-        var = "x"
-        try:
-            symbol = sp.symbols(var)
-            expr_sym = parse_expr(self.expression, transformations=transformations)
-            int_expr = sp.integrate(expr_sym, symbol)
-            result = sp.N(int_expr)
-            self.add_history(f"∫({self.expression}) d{var} = {result}")
-            self.expression = str(result)
-        except Exception:
-            self.expression = "Error"
-        self._update_display()
-
-    def solve_equation(self):
-        var = "x"
-        try:
-            if "=" in self.expression:
-                lhs, rhs = self.expression.split("=")
-                eq_expr = sp.Eq(parse_expr(lhs, transformations=transformations),
-                                  parse_expr(rhs, transformations=transformations))
-            else:
-                eq_expr = sp.Eq(parse_expr(self.expression, transformations=transformations), 0)
-            symbol = sp.symbols(var)
-            solutions = sp.solve(eq_expr, symbol)
-            self.add_history(f"Solve({self.expression}) = {solutions}")
-            self.expression = str(solutions)
-        except Exception:
-            self.expression = "Error"
-        self._update_display()
-
-    import re
-
-    def solve_ode(self):
-        try:
-            # Define symbols and function for ODE solving.
-            x = sp.symbols("x")
-            y = sp.Function("y")
-            # Clean and prepare the input.
-            ode_input = self.expression.strip()
-            # Replace any form of "dy/dx" (ignoring spaces) with the proper derivative notation.
-            ode_input = re.sub(r"d\s*y\s*/\s*d\s*x", "Derivative(y(x), x)", ode_input, flags=re.IGNORECASE)
-            # Split the equation at the first "=" sign.
-            match = re.match(r"(.+?)=(.+)", ode_input)
-            if match:
-                lhs = match.group(1).strip()
-                rhs = match.group(2).strip()
-                # Replace bare 'y' with 'y(x)' in the right-hand side.
-                rhs = re.sub(r"\by\b(?!\()", "y(x)", rhs)
-                local_dict = {"x": x, "y": y, "Derivative": sp.Derivative}
-                lhs_expr = parse_expr(lhs, local_dict=local_dict, transformations=transformations)
-                rhs_expr = parse_expr(rhs, local_dict=local_dict, transformations=transformations)
-                ode_sym = sp.Eq(lhs_expr, rhs_expr)
-            else:
-                # If no '=' is found, assume the expression equals zero.
-                local_dict = {"x": x, "y": y, "Derivative": sp.Derivative}
-                ode_expr = parse_expr(ode_input, local_dict=local_dict, transformations=transformations)
-                ode_sym = sp.Eq(ode_expr, 0)
-            sol = sp.dsolve(ode_sym)
-            self.add_history(f"Solve ODE({self.expression}) = {sol}")
-            self.expression = str(sol.rhs) if hasattr(sol, "rhs") else str(sol)
-        except Exception as e:
-            self.expression = "Error: " + str(e)
-        self._update_display()
-
-
-
-
-    def fourier_transform(self):
-        # Compute the Fourier transform of the given expression with respect to x
-        var = sp.symbols("x")
-        w = sp.symbols("w")
-        try:
-            expr_sym = parse_expr(self.expression, transformations=transformations)
-            ft = sp.fourier_transform(expr_sym, var, w)
-            self.add_history(f"Fourier({self.expression}) = {ft}")
-            self.expression = str(ft)
-        except Exception:
-            self.expression = "Error"
-        self._update_display()
-
-    def latex_render(self):
-        # Render the current expression as LaTeX in a pop-up window.
-        try:
-            expr_sym = parse_expr(self.expression, transformations=transformations)
-            latex_str = sp.latex(expr_sym)
-        except Exception:
-            latex_str = "Error"
-        latex_window = ctk.CTkToplevel(self)
-        latex_window.title("LaTeX Render")
-        latex_window.geometry("600x200")
-        label = ctk.CTkLabel(latex_window, text=latex_str, font=("Arial", 16), wraplength=580)
-        label.pack(padx=10, pady=10)
-        self.add_history(f"LaTeX Render: {latex_str}")
-
-    def matrix_operations(self):
-        # Basic matrix operations: determinant and inverse.
-        try:
-            expr_sym = parse_expr(self.expression, transformations=transformations)
-            det = expr_sym.det() if hasattr(expr_sym, "det") else "N/A"
-            inv = expr_sym.inv() if hasattr(expr_sym, "inv") else "N/A"
-            self.add_history(f"Matrix Det: {det}\nMatrix Inv: {inv}")
-            self.expression = f"Det: {det}"
-        except Exception:
-            self.expression = "Error"
-        self._update_display()
-
-    def memory_clear(self):
-        self.memory = 0
-        self.add_history("Memory Cleared")
-
-    def memory_recall(self):
-        self.expression += str(self.memory)
-        self._update_display()
-        self.add_history(f"Memory Recalled: {self.memory}")
-
-    def memory_add(self):
-        try:
-            value = float(eval(self.expression.replace('^', '**'), {"__builtins__": None}, allowed_names))
-            self.memory += value
-            self.add_history(f"Memory Added: {value} -> {self.memory}")
-        except Exception:
-            self.add_history("Memory Add Error")
-
-    def memory_subtract(self):
-        try:
-            value = float(eval(self.expression.replace('^', '**'), {"__builtins__": None}, allowed_names))
-            self.memory -= value
-            self.add_history(f"Memory Subtracted: {value} -> {self.memory}")
-        except Exception:
-            self.add_history("Memory Subtract Error")
-
-    def handle_key(self, event):
-        if event.keysym == "Return":
-            self.click("=")
-            return "break"
-        elif event.keysym == "BackSpace":
-            self.click("Del")
-            return "break"
-        elif event.keysym == "Escape":
-            self.click("C")
-            return "break"
-        else:
-            return
-
-    def graph_expression(self):
-        self.graph_window = ctk.CTkToplevel(self)
-        self.graph_window.title("Graph Options")
-        self.graph_window.attributes("-topmost", True)
-        self.graph_window.geometry("700x600")
-        domain_frame = ctk.CTkFrame(self.graph_window)
-        domain_frame.pack(padx=10, pady=10, fill="x")
-        x_min_label = ctk.CTkLabel(domain_frame, text="X min:")
-        x_min_label.grid(row=0, column=0, padx=5, pady=5)
-        self.x_min_entry = ctk.CTkEntry(domain_frame, width=80)
-        self.x_min_entry.grid(row=0, column=1, padx=5, pady=5)
-        self.x_min_entry.insert(0, "-10")
-        x_max_label = ctk.CTkLabel(domain_frame, text="X max:")
-        x_max_label.grid(row=0, column=2, padx=5, pady=5)
-        self.x_max_entry = ctk.CTkEntry(domain_frame, width=80)
-        self.x_max_entry.grid(row=0, column=3, padx=5, pady=5)
-        self.x_max_entry.insert(0, "10")
-        var_label = ctk.CTkLabel(domain_frame, text="Variable:")
-        var_label.grid(row=1, column=0, padx=5, pady=5)
-        self.var_entry = ctk.CTkEntry(domain_frame, width=80)
-        self.var_entry.grid(row=1, column=1, padx=5, pady=5)
-        self.var_entry.insert(0, "x")
-        add_func_button = ctk.CTkButton(domain_frame, text="Add Function", command=self.add_function_to_plot)
-        add_func_button.grid(row=1, column=2, padx=5, pady=5)
-        plot_button = ctk.CTkButton(domain_frame, text="Plot Graph", command=self.plot_graph)
-        plot_button.grid(row=1, column=3, padx=5, pady=5)
-        
-        self.func_list = ctk.CTkTextbox(self.graph_window, font=("Arial", 12))
-        self.func_list.pack(padx=10, pady=10, fill="x")
-        self.func_list.insert("0.0", "Functions to Plot:\n")
-        self.func_list.configure(state="disabled")
-        
-        self.graph_frame = ctk.CTkFrame(self.graph_window)
-        self.graph_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-    def add_function_to_plot(self):
-        if self.expression.strip():
-            self.func_list.configure(state="normal")
-            self.func_list.insert("end", self.expression + "\n")
-            self.func_list.configure(state="disabled")
-            self.add_history(f"Added function for plotting: {self.expression}")
-    
-    def plot_graph(self):
-        try:
-            x_min = float(self.x_min_entry.get())
-            x_max = float(self.x_max_entry.get())
-        except Exception:
-            x_min, x_max = -10, 10
-        var = self.var_entry.get().strip() or "x"
-        funcs_text = self.func_list.get("1.0", "end").strip().splitlines()[1:]
-        all_funcs = []
-        if self.expression.strip():
-            all_funcs.append(self.expression)
-        for f_text in funcs_text:
-            if f_text.strip():
-                all_funcs.append(f_text.strip())
-        if not all_funcs:
-            return
-        x_vals = np.linspace(x_min, x_max, 400)
-        fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
-        colors = ["blue", "red", "green", "orange", "purple", "brown"]
-        for idx, func_expr in enumerate(all_funcs):
-            expr_str = func_expr.replace('^', '**')
-            sympy_locals = {"sin": sp.sin, "cos": sp.cos, "tan": sp.tan,
-                            "log": sp.log, "ln": sp.log, "sqrt": sp.sqrt,
-                            "exp": sp.exp, "pi": sp.pi, "e": sp.E}
-            try:
-                symbol = sp.symbols(var)
-                expr_sym = parse_expr(expr_str, local_dict=sympy_locals, transformations=transformations)
-                f = sp.lambdify(symbol, expr_sym, "numpy")
-                y_vals = f(x_vals)
-                if np.isscalar(y_vals):
-                    y_vals = np.full_like(x_vals, float(y_vals))
-                else:
-                    y_vals = np.array(y_vals, dtype=np.float64)
-                    if y_vals.shape != x_vals.shape:
-                        y_const = float(y_vals)
-                        y_vals = np.full(x_vals.shape, y_const)
-                ax.plot(x_vals, y_vals, color=colors[idx % len(colors)], label=func_expr)
-            except Exception as e:
-                self.add_history(f"Error plotting {func_expr}: {e}")
-        ax.set_xlabel(var)
-        ax.set_ylabel("f(" + var + ")")
-        ax.grid(True)
-        ax.legend()
-        for widget in self.graph_frame.winfo_children():
-            widget.destroy()
-        canvas = FigureCanvasTkAgg(fig, master=self.graph_frame)
-        canvas.draw()
-        toolbar = NavigationToolbar2Tk(canvas, self.graph_frame)
-        toolbar.update()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-        self.graph_window.update_idletasks()
-
-    def handle_key(self, event):
-        if event.keysym == "Return":
-            self.click("=")
-            return "break"
-        elif event.keysym == "BackSpace":
-            self.click("Del")
-            return "break"
-        elif event.keysym == "Escape":
-            self.click("C")
-            return "break"
-        else:
-            return
-
-    def memory_clear(self):
-        self.memory = 0
-        self.add_history("Memory Cleared")
-
-    def memory_recall(self):
-        self.expression += str(self.memory)
-        self._update_display()
-        self.add_history(f"Memory Recalled: {self.memory}")
-
-    def memory_add(self):
-        try:
-            value = float(eval(self.expression.replace('^', '**'), {"__builtins__": None}, allowed_names))
-            self.memory += value
-            self.add_history(f"Memory Added: {value} -> {self.memory}")
-        except Exception:
-            self.add_history("Memory Add Error")
-
-    def memory_subtract(self):
-        try:
-            value = float(eval(self.expression.replace('^', '**'), {"__builtins__": None}, allowed_names))
-            self.memory -= value
-            self.add_history(f"Memory Subtracted: {value} -> {self.memory}")
-        except Exception:
-            self.add_history("Memory Subtract Error")
-
-if __name__ == "__main__":
-    ctk.set_appearance_mode("Dark")
-    ctk.set_default_color_theme("blue")
-    app = AdvancedScientificCalculator()
-    app.mainloop()
+import customtkinter as ctk
+import re
+import sys
+import functools
+import math
+import threading
+import warnings
+import concurrent.futures
+
+# numpy/matplotlib/sympy are imported lazily via _load_heavy(), and mpmath via
+# _load_mpmath(): together they cost hundreds of ms and tens of MB of RSS at
+# startup, and sessions that only use the float fast path never touch them.
+mp = None
+allowed_names = None
+np = None
+plt = None
+FigureCanvasTkAgg = None
+NavigationToolbar2Tk = None
+sp = None
+parse_expr = None
+transformations = None
+calc_locals = None
+calc_locals_key = None
+sympy_locals = None
+sympy_globals = None
+se = None
+
+_heavy_lock = threading.Lock()
+
+def _load_heavy():
+    global np, plt, FigureCanvasTkAgg, NavigationToolbar2Tk
+    global parse_expr, transformations, calc_locals, calc_locals_key
+    global sympy_locals, sympy_globals, se, sp
+    if sp is not None:
+        return
+    with _heavy_lock:
+        if sp is not None:
+            return
+        import numpy
+        import matplotlib.pyplot
+        from matplotlib.backends import backend_tkagg
+        import sympy
+        from sympy.parsing import sympy_parser
+        np = numpy
+        plt = matplotlib.pyplot
+        FigureCanvasTkAgg = backend_tkagg.FigureCanvasTkAgg
+        NavigationToolbar2Tk = backend_tkagg.NavigationToolbar2Tk
+        parse_expr = sympy_parser.parse_expr
+        # Use transformations to support implicit multiplication (e.g., "2x" -> "2*x")
+        transformations = sympy_parser.standard_transformations + \
+            (sympy_parser.implicit_multiplication_application,)
+        # Parse-time bindings so "log" means base-10 inside sympy, matching
+        # allowed_names; an explicit base like log(8, 2) still passes through
+        calc_locals = {"log": lambda x, base=10: sympy.log(x, base),
+                       "ln": sympy.log}
+        calc_locals_key = tuple(calc_locals.items())
+        # Sympy equivalents of the calculator functions, used when parsing for plots
+        sympy_locals = {"sin": sympy.sin, "cos": sympy.cos, "tan": sympy.tan,
+                        "log": sympy.log, "ln": sympy.log, "sqrt": sympy.sqrt,
+                        "exp": sympy.exp, "pi": sympy.pi, "e": sympy.E}
+        # Prebuilt global namespace for parse_expr: with global_dict=None it
+        # re-execs "from sympy import *" on every single call
+        sympy_globals = {}
+        exec("from sympy import *", sympy_globals)
+        # Optional C++ backend: 10-100x faster than sympy for parsing and
+        # basic algebra where its API covers the operation
+        try:
+            import symengine
+            se = symengine
+        except ImportError:
+            se = None
+        # sp is the published "loaded" flag; assign it last
+        sp = sympy
+
+# Default working precision in bits (~60 decimal digits). Keeping this small
+# keeps every mpmath operation on a handful of GMP limbs instead of huge
+# bignums; raise it only when a computation actually needs more digits.
+DEFAULT_PREC = 200
+
+def _load_mpmath():
+    global mp, allowed_names
+    if mp is not None:
+        return
+    with _heavy_lock:
+        if mp is not None:
+            return
+        import mpmath
+        # gmpy2 swaps mpmath's (and sympy's) bignum backend to GMP, which is
+        # ~10x faster for the multi-limb arithmetic behind evalf/mpf/solve.
+        # Both libraries auto-detect it on import, so just nudge the user.
+        try:
+            import gmpy2  # noqa: F401
+        except ImportError:
+            warnings.warn("install gmpy2 for ~10x faster high-precision "
+                          "arithmetic (auto-detected by mpmath and sympy)")
+        mpmath.mp.prec = DEFAULT_PREC
+        # Allowed names for mpmath evaluation
+        allowed_names = {
+            "sin": mpmath.sin,
+            "cos": mpmath.cos,
+            "tan": mpmath.tan,
+            "log": lambda x, base=10: mpmath.log(x, base),
+            "ln": mpmath.log,
+            "sqrt": mpmath.sqrt,
+            "exp": mpmath.exp,
+            "pi": mpmath.pi,
+            "e": mpmath.e
+        }
+        # mp is the published "loaded" flag; assign it last
+        mp = mpmath
+
+# Float64 twins of allowed_names: one libm call instead of bignum evaluation
+allowed_names_fast = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "log": lambda x, base=10: math.log(x, base),
+    "ln": math.log,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "pi": math.pi,
+    "e": math.e
+}
+
+# Precompiled solve_ode preprocessing patterns (compiled once, not per call)
+_DY_DX_RE = re.compile(r"d\s*y\s*/\s*d\s*x", re.IGNORECASE)
+_Y_BARE_RE = re.compile(r"\by\b(?!\()")
+_EQ_SPLIT_RE = re.compile(r"(.+?)=(.+)")
+
+def _cached_parse(expr_str, local_key=None):
+    # Interned keys make repeat cache hits an identity compare instead of a
+    # char-by-char string compare, and repeated operations on the same
+    # expression text share one string object
+    return _cached_parse_impl(sys.intern(expr_str), local_key)
+
+@functools.lru_cache(maxsize=256)
+def _cached_parse_impl(expr_str, local_key=None):
+    # parse_expr is expensive (tokenize + transformations + sympify); caching
+    # by string makes e.g. Integrate after Differentiate on the same input
+    # skip the parse entirely. local_key is a hashable tuple of dict items.
+    _load_heavy()
+    local_dict = dict(local_key) if local_key else None
+    return parse_expr(expr_str, local_dict=local_dict, global_dict=sympy_globals,
+                      transformations=transformations)
+
+@functools.lru_cache(maxsize=16)
+def _sym(name):
+    # Reuse Symbol objects so repeated plots/derivatives don't re-allocate them
+    return sp.symbols(name)
+
+@functools.lru_cache(maxsize=64)
+def _build_plot_callable(expr_str, var):
+    _load_heavy()
+    # Parse + lambdify is the expensive part of plotting; callers cache the
+    # result so replotting the same expression with a new domain is just a
+    # numpy evaluation. cse=True folds repeated subexpressions before codegen.
+    symbol = _sym(var)
+    # evaluate=False skips sympy's canonicalization pass; the expression is
+    # only lambdified, so the symbolic simplification would be wasted work
+    expr_sym = parse_expr(expr_str, local_dict=sympy_locals, global_dict=sympy_globals,
+                          transformations=transformations, evaluate=False)
+    if symbol not in expr_sym.free_symbols:
+        # Constant expression: hand back the value itself so the caller can
+        # draw a two-point line instead of sampling and filling a vector
+        return float(expr_sym.evalf())
+    # Fold exact constants (pi, sin(1), 2*sqrt(3), ...) into float literals so
+    # the generated code does pure float arithmetic at every sample point
+    # instead of re-evaluating symbolic constants
+    expr_sym = expr_sym.evalf()
+    # Prefer numexpr when it can handle the expression: it fuses the whole
+    # operator tree into one cache-blocked SIMD pass with no per-op temps.
+    try:
+        import numexpr as ne
+        src = str(expr_sym)
+
+        def f_ne(xs, _src=src, _var=var):
+            return ne.evaluate(_src, local_dict={_var: xs, "pi": np.pi,
+                                                 "e": np.e, "E": np.e})
+        f_ne(np.zeros(2))  # raises if numexpr lacks a function involved
+        return f_ne
+    except Exception:
+        pass
+    try:
+        f = sp.lambdify(symbol, expr_sym, "numpy", cse=True)
+    except TypeError:
+        # the cse keyword needs sympy >= 1.9
+        f = sp.lambdify(symbol, expr_sym, "numpy")
+    # If numba is available, compile the kernel. Preferred form: lambdify to
+    # a scalar math-module function and numba.vectorize it — the scalar
+    # kernel compiles far more reliably than the numpy form and the ufunc
+    # runs as one fused C loop with no per-op temporaries.
+    try:
+        import numba
+        f_scalar = sp.lambdify(symbol, expr_sym, "math")
+        f_vec = numba.vectorize(fastmath=True)(f_scalar)
+        f_vec(np.zeros(1))  # force compilation; raises if unsupported
+        return f_vec
+    except Exception:
+        pass
+    # Fallback: JIT the numpy callable directly. Numba can't compile every
+    # lambdified expression, so fall back to plain numpy in the end.
+    try:
+        from numba import njit
+        f_jit = njit(fastmath=True, cache=True)(f)
+        f_jit(np.zeros(1))  # force compilation; raises if unsupported
+        return f_jit
+    except Exception:
+        return f
+
+@functools.lru_cache(maxsize=16)
+def _build_multi_callable(expr_strs, var):
+    # Lambdify all var-dependent expressions as one Matrix so a replot
+    # evaluates every function in a single numpy call, with CSE sharing
+    # subterms across rows. Constant rows can't share the sample grid's
+    # shape, so they come back separately as index -> value.
+    _load_heavy()
+    symbol = _sym(var)
+    exprs = [parse_expr(s, local_dict=sympy_locals, global_dict=sympy_globals,
+                        transformations=transformations) for s in expr_strs]
+    consts = {i: float(e.evalf()) for i, e in enumerate(exprs)
+              if symbol not in e.free_symbols}
+    live = [e.evalf() for i, e in enumerate(exprs) if i not in consts]
+    if not live:
+        return None, consts
+    combined = sp.Matrix(live)
+    try:
+        F = sp.lambdify(symbol, combined, "numpy", cse=True)
+    except TypeError:
+        F = sp.lambdify(symbol, combined, "numpy")
+    return F, consts
+
+def _adaptive_sample(f, x_min, x_max, tol=1e-3, max_pts=1024):
+    # Start from a coarse grid and bisect any interval whose midpoint strays
+    # from the chord, so smooth regions stay cheap while sharp features and
+    # near-singularities get refined instead of plotted as garbage.
+    xs = np.linspace(x_min, x_max, 65)
+    ys = f(xs)
+    if np.ndim(ys) == 0:  # constant expression (plain scalar or 0-d array)
+        ys = np.full_like(xs, float(ys))
+    xs = list(xs)
+    ys = [float(y) for y in np.asarray(ys, dtype=np.float64)]
+    finite = [y for y in ys if np.isfinite(y)]
+    span = (max(finite) - min(finite)) if finite else 0.0
+    span = span or 1.0
+    i = 0
+    while i < len(xs) - 1 and len(xs) < max_pts:
+        x_mid = 0.5 * (xs[i] + xs[i + 1])
+        y_mid = float(f(x_mid))
+        chord = 0.5 * (ys[i] + ys[i + 1])
+        if np.isfinite(y_mid) and abs(y_mid - chord) > tol * span:
+            xs.insert(i + 1, x_mid)
+            ys.insert(i + 1, y_mid)
+        else:
+            i += 1
+    return np.asarray(xs), np.asarray(ys)
+
+@functools.lru_cache(maxsize=8)
+def _deg_factors(dps):
+    # Degree/radian conversion factors, computed once per precision setting
+    # instead of rebuilding pi on every toDeg/toRad press
+    _load_mpmath()
+    with mp.workdps(dps):
+        return mp.mpf(180) / mp.pi, mp.pi / mp.mpf(180)
+
+@functools.lru_cache(maxsize=256)
+def _mpy_form(s):
+    # Cached '^' -> '**' normalization for typed input (button input already
+    # inserts '**' directly); avoids re-scanning the string per evaluation
+    return s.replace('^', '**')
+
+@functools.lru_cache(maxsize=256)
+def _compile(expr):
+    # Cache compiled bytecode so repeated evaluations of the same expression
+    # skip the tokenize/parse/compile pipeline and only run the interpreter.
+    return compile(expr, "<calc>", "eval")
+
+class AdvancedScientificCalculator(ctk.CTk):
+    # Shift mapping for digit buttons (for alternative variable insertion)
+    shift_mapping = {
+        "7": "x", "8": "y", "9": "z",
+        "4": "a", "5": "b", "6": "c",
+        "1": "d", "2": "e", "3": "f",
+        "0": "g"
+    }
+    # Button display text, formatted once instead of per-widget at startup
+    _display_text = {k: f"{k} ({v})" for k, v in shift_mapping.items()}
+    # translate() form of shift_mapping: one C-level pass, unmapped
+    # characters fall through untouched
+    _shift_trans = str.maketrans(shift_mapping)
+
+    def __init__(self):
+        super().__init__()
+        self.title("Extremely Advanced Scientific Calculator")
+        self.geometry("1200x900")
+        self.configure(bg_color="#1e1e1e")
+        self.attributes("-topmost", True)
+        
+        # Internal state
+        self.expression = ""
+        self.history = []
+        self.shift_mode = False
+        self.high_precision = False
+        self.memory = 0
+        self._symbolic_cache = {}
+        self._expr_after = None
+        self._history_buffer = []
+        self._history_after = None
+        self._fig = None
+        # Blit support: Line2D objects reused across replots, the cached
+        # axes background, and the (functions, variable) they belong to
+        self._lines = []
+        self._bg = None
+        self._plot_state = None
+        # Worker pool for symbolic operations (diff/integrate/solve/ode/
+        # fourier) so multi-second sympy calls don't freeze the Tk thread
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+        self.func_map = {
+            "sin": "sin(", "cos": "cos(", "tan": "tan(",
+            "log": "log(", "ln": "ln(", "√": "sqrt(",
+            "exp": "exp(", "x^y": "**"
+        }
+        # Dispatch table for click(): bound-method lookup per press
+        self._key_handlers = {
+            "=": self._do_equals,
+            "C": self._do_clear,
+            "Del": self._do_delete,
+            "toDeg": self._do_todeg,
+            "toRad": self._do_torad,
+            "Graph": self.graph_expression,
+        }
+
+        # Top menu frame with advanced function buttons
+        menu_frame = ctk.CTkFrame(self, fg_color="#2e2e2e", corner_radius=10)
+        menu_frame.grid(row=0, column=0, columnspan=10, padx=10, pady=10, sticky="nsew")
+        self.diff_button = ctk.CTkButton(menu_frame, text="Differentiate", command=self.differentiate_expression, width=120)
+        self.diff_button.grid(row=0, column=0, padx=5, pady=5)
+        self.int_button = ctk.CTkButton(menu_frame, text="Integrate", command=self.integrate_expression, width=120)
+        self.int_button.grid(row=0, column=1, padx=5, pady=5)
+        self.solve_button = ctk.CTkButton(menu_frame, text="Solve Eqn", command=self.solve_equation, width=120)
+        self.solve_button.grid(row=0, column=2, padx=5, pady=5)
+        self.ode_button = ctk.CTkButton(menu_frame, text="Solve ODE", command=self.solve_ode, width=120)
+        self.ode_button.grid(row=0, column=3, padx=5, pady=5)
+        self.fourier_button = ctk.CTkButton(menu_frame, text="Fourier", command=self.fourier_transform, width=120)
+        self.fourier_button.grid(row=0, column=4, padx=5, pady=5)
+        self.latex_button = ctk.CTkButton(menu_frame, text="LaTeX Render", command=self.latex_render, width=120)
+        self.latex_button.grid(row=0, column=5, padx=5, pady=5)
+        self.matrix_button = ctk.CTkButton(menu_frame, text="Matrix Ops", command=self.matrix_operations, width=120)
+        self.matrix_button.grid(row=0, column=6, padx=5, pady=5)
+        self.mem_clear = ctk.CTkButton(menu_frame, text="MC", command=self.memory_clear, width=60)
+        self.mem_clear.grid(row=0, column=7, padx=5, pady=5)
+        self.mem_recall = ctk.CTkButton(menu_frame, text="MR", command=self.memory_recall, width=60)
+        self.mem_recall.grid(row=0, column=8, padx=5, pady=5)
+        self.mem_add = ctk.CTkButton(menu_frame, text="M+", command=self.memory_add, width=60)
+        self.mem_add.grid(row=0, column=9, padx=5, pady=5)
+        self.mem_sub = ctk.CTkButton(menu_frame, text="M-", command=self.memory_subtract, width=60)
+        self.mem_sub.grid(row=0, column=10, padx=5, pady=5)
+        # Working precision (decimal digits) for the HiPrec/mpmath paths
+        prec_label = ctk.CTkLabel(menu_frame, text="Digits:")
+        prec_label.grid(row=0, column=11, padx=5, pady=5)
+        self.precision_entry = ctk.CTkEntry(menu_frame, width=60)
+        self.precision_entry.grid(row=0, column=12, padx=5, pady=5)
+        self.precision_entry.insert(0, "50")
+
+        # Editable expression entry
+        self.expr_var = ctk.StringVar(value="")
+        self.entry = ctk.CTkEntry(self, textvariable=self.expr_var, font=("Arial", 24),
+                                   justify="right", height=50)
+        self.entry.grid(row=1, column=0, columnspan=10, padx=20, pady=10, sticky="nsew")
+        # Sync entry -> state only on user typing; button handlers already own
+        # the canonical value, so no variable trace (which would fire a
+        # redundant callback on every programmatic set) is installed.
+        self.entry.bind("<KeyRelease>", self.update_expression_from_entry)
+        
+        # Basic shift toggle button
+        self.shift_button = ctk.CTkButton(self, text="Shift Off", font=("Arial", 18),
+                                          command=self.toggle_shift, height=50)
+        self.shift_button.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+
+        # Toggle between the fast float64 path and full mpmath precision
+        self.precision_button = ctk.CTkButton(self, text="HiPrec Off", font=("Arial", 18),
+                                              command=self.toggle_precision, height=50)
+        self.precision_button.grid(row=2, column=2, columnspan=2, padx=10, pady=10, sticky="nsew")
+
+        # Basic calculator buttons layout
+        buttons = [
+            ["sin", "cos", "tan", "log"],
+            ["ln", "√", "x^y", "exp"],
+            ["7", "8", "9", "/"],
+            ["4", "5", "6", "*"],
+            ["1", "2", "3", "+"],
+            ["-", "0", ".", "("],
+            [")", "pi", "e", "C"],
+            ["=", "Del", "toDeg", "toRad"],
+            ["Graph"]
+        ]
+        row_index = 3
+        make_button = self.create_button_widget
+        for row in buttons:
+            for col_index, btn_text in enumerate(row):
+                make_button(btn_text).grid(row=row_index, column=col_index,
+                                           padx=5, pady=5, sticky="nsew")
+            row_index += 1
+
+        # History panel on the right
+        self.history_box = ctk.CTkTextbox(self, font=("Arial", 12))
+        self.history_box.grid(row=1, column=10, rowspan=row_index, padx=10, pady=10, sticky="nsew")
+        self.history_box.insert("0.0", "History:\n")
+        self.history_box.configure(state="disabled")
+
+        # Configure grid weights
+        for i in range(row_index+1):
+            self.grid_rowconfigure(i, weight=1)
+        for j in range(11):
+            self.grid_columnconfigure(j, weight=1)
+
+        # Bind keyboard events and Ctrl+G for graph. Per-key bindings with
+        # functools.partial (a C-level callable) replace one generic handler
+        # that dispatched on event.keysym in Python for every keystroke.
+        self.bind_all("<Return>", functools.partial(self._key, "="))
+        self.bind_all("<BackSpace>", functools.partial(self._key, "Del"))
+        self.bind_all("<Escape>", functools.partial(self._key, "C"))
+        self.bind_all("<Control-g>", functools.partial(self._key, "Graph"))
+
+        # Warm the heavy imports in the background so the first Graph or
+        # symbolic click doesn't stall the UI
+        def _warm():
+            _load_mpmath()
+            _load_heavy()
+        threading.Thread(target=_warm, daemon=True).start()
+
+    def update_expression_from_entry(self, event):
+        # Debounced: rapid typing coalesces into one state sync after the
+        # keystroke burst instead of a string copy per key
+        if self._expr_after is not None:
+            self.after_cancel(self._expr_after)
+        self._expr_after = self.after(50, self._sync_expression)
+
+    def _sync_expression(self):
+        self._expr_after = None
+        self.expression = self.expr_var.get()
+
+    def create_button_widget(self, btn_text):
+        # partial is a C-level callable, cheaper per press than a lambda frame
+        return ctk.CTkButton(self, text=self._display_text.get(btn_text, btn_text),
+                             font=("Arial", 18),
+                             command=functools.partial(self.click, btn_text), height=50)
+
+    def _current_dps(self):
+        try:
+            return max(1, int(self.precision_entry.get()))
+        except Exception:
+            return 50
+
+    def _eval_precise(self, expr):
+        _load_heavy()
+        # Parse using implicit multiplication transformation for human-friendly
+        # input, then evaluate numerically at the user-selected precision.
+        # evalf works straight off the parsed tree, instead of round-tripping
+        # through str() + eval() which re-parsed the expression a second time.
+        expr_sym = _cached_parse(expr, calc_locals_key)
+        dps = self._current_dps()
+        if not expr_sym.free_symbols:
+            return expr_sym.evalf(dps)
+        # Free variables left: fall back to the namespace eval, whose
+        # NameError surfaces as "Error" in the caller. Stringify inside the
+        # context: the caller formats the result after it exits, and an mpf
+        # renders at the active context's dps, not the one it was computed at
+        _load_mpmath()
+        with mp.workdps(dps):
+            return str(eval(_compile(str(expr_sym)), {"__builtins__": None}, allowed_names))
+
+    def toggle_shift(self):
+        self.shift_mode = not self.shift_mode
+        self.shift_button.configure(text="Shift On" if self.shift_mode else "Shift Off")
+
+    def toggle_precision(self):
+        self.high_precision = not self.high_precision
+        self.precision_button.configure(text="HiPrec On" if self.high_precision else "HiPrec Off")
+
+    def click(self, key):
+        # Flush any pending entry sync so e.g. typing then hitting Return
+        # immediately still evaluates the full text
+        if self._expr_after is not None:
+            self.after_cancel(self._expr_after)
+            self._sync_expression()
+        # Single table lookup instead of an if/elif chain per button press;
+        # anything without a dedicated handler is appended to the expression
+        handler = self._key_handlers.get(key)
+        if handler is not None:
+            handler()
+        else:
+            self._append(key)
+
+    def _do_equals(self):
+        try:
+            expr = _mpy_form(self.expression)
+            if not self.high_precision:
+                # Fast float64 path: evaluate the raw expression against
+                # math-module names directly — no sympy parse, one libm
+                # call per function. Falls through to the mpmath path on
+                # overflow, domain errors, or syntax the math layer can't
+                # take (e.g. implicit multiplication).
+                try:
+                    result = eval(_compile(expr), {"__builtins__": None}, allowed_names_fast)
+                except Exception:
+                    result = self._eval_precise(expr)
+            else:
+                result = self._eval_precise(expr)
+            self.add_history(f"{expr} = {result}")
+            self.expression = str(result)
+        except Exception:
+            self.expression = "Error"
+        self._update_display()
+
+    def _do_clear(self):
+        self.expression = ""
+        self._update_display()
+
+    def _do_delete(self):
+        self.expression = self.expression[:-1]
+        self._update_display()
+
+    def _do_todeg(self):
+        try:
+            _load_mpmath()
+            dps = self._current_dps()
+            with mp.workdps(dps):
+                value = mp.mpf(self.expression)
+                # str() inside the context so the mpf renders at the selected
+                # dps, not the default context's precision
+                converted = str(value * _deg_factors(dps)[0])
+            self.add_history(f"toDeg({self.expression}) = {converted}")
+            self.expression = converted
+        except Exception:
+            self.expression = "Error"
+        self._update_display()
+
+    def _do_torad(self):
+        try:
+            _load_mpmath()
+            dps = self._current_dps()
+            with mp.workdps(dps):
+                value = mp.mpf(self.expression)
+                # str() inside the context so the mpf renders at the selected
+                # dps, not the default context's precision
+                converted = str(value * _deg_factors(dps)[1])
+            self.add_history(f"toRad({self.expression}) = {converted}")
+            self.expression = converted
+        except Exception:
+            self.expression = "Error"
+        self._update_display()
+
+    def _append(self, key):
+        # translate() maps shifted digits and passes everything else through
+        # in one C call — no isdigit test or dict lookup chain
+        if self.shift_mode:
+            key = key.translate(self._shift_trans)
+        # Function buttons insert their internal form directly (x^y
+        # inserts "**"), so button input needs no normalization at "=";
+        # the replace('^', '**') at eval sites stays for typed input.
+        self.expression += self.func_map.get(key, key)
+        self._update_display()
+
+    def _update_display(self):
+        self.expr_var.set(self.expression)
+
+    def add_history(self, text):
+        # Buffer entries and flush once per idle cycle: each append otherwise
+        # pays a normal/insert/disabled/see roundtrip into Tk, which dominates
+        # when several entries arrive in one handler (e.g. per-line plot errors)
+        self.history.append(text)
+        self._history_buffer.append(text)
+        if self._history_after is None:
+            self._history_after = self.after_idle(self._flush_history)
+
+    def _flush_history(self):
+        self._history_after = None
+        if not self._history_buffer:
+            return
+        lines = "\n".join(self._history_buffer) + "\n"
+        self._history_buffer.clear()
+        self.history_box.configure(state="normal")
+        self.history_box.insert("end", lines)
+        self.history_box.configure(state="disabled")
+        self.history_box.see("end")
+
+    def _symbolic_cached(self, key, compute):
+        # diff/integrate/solve/fourier are the most expensive operations in
+        # the file; repeat presses on the same input hit this bounded cache
+        # instead of recomputing
+        cached = self._symbolic_cache.get(key)
+        if cached is None:
+            cached = compute()
+            if len(self._symbolic_cache) >= 128:
+                self._symbolic_cache.pop(next(iter(self._symbolic_cache)))
+            self._symbolic_cache[key] = cached
+        return cached
+
+    def _run_symbolic(self, button, compute, on_done):
+        # sp.integrate/dsolve/solve/fourier_transform can run for seconds;
+        # submitting them to the worker pool keeps the Tk thread pumping
+        # events. The outcome is marshalled back onto the Tk thread with
+        # after(); the pressed button is disabled meanwhile so a slow
+        # computation can't be re-submitted.
+        button.configure(state="disabled")
+
+        def _finish(result, error):
+            button.configure(state="normal")
+            on_done(result, error)
+
+        def _worker():
+            try:
+                result, error = compute(), None
+            except Exception as e:
+                result, error = None, e
+            self.after(0, _finish, result, error)
+
+        self._pool.submit(_worker)
+
+    def _solve_equation_impl(self, expr):
+        if "=" in expr:
+            lhs, rhs = expr.split("=")
+            eq_expr = sp.Eq(_cached_parse(lhs), _cached_parse(rhs))
+        else:
+            eq_expr = sp.Eq(_cached_parse(expr), 0)
+        return sp.solve(eq_expr, _sym("x"))
+
+    def _differentiate_impl(self, expr):
+        # Differentiate through symengine when it's installed: its C++ core
+        # is 10-100x faster than sympy for parsing and diff. symengine can't
+        # take implicit multiplication (or anything else exotic), so any
+        # failure falls through to the sympy path. Other handlers (integrate,
+        # dsolve, fourier) stay on sympy, which symengine doesn't cover.
+        if se is not None:
+            try:
+                d = se.diff(se.sympify(expr.replace('^', '**')),
+                            se.Symbol("x"))
+                return sp.N(sp.sympify(str(d)))
+            except Exception:
+                pass
+        return sp.N(sp.diff(_cached_parse(expr), _sym("x")))
+
+    def differentiate_expression(self):
+        var = "x"
+        expr = self.expression
+
+        def compute():
+            _load_heavy()
+            return self._symbolic_cached(
+                ("diff", expr, var),
+                functools.partial(self._differentiate_impl, expr))
+
+        def done(result, error):
+            if error is not None:
+                self.expression = "Error"
+            else:
+                self.add_history(f"d/d{var}({expr}) = {result}")
+                self.expression = str(result)
+            self._update_display()
+
+        self._run_symbolic(self.diff_button, compute, done)
+
+    def integrate_expression(self):
+        var = "x"
+        expr = self.expression
+
+        def compute():
+            _load_heavy()
+            return self._symbolic_cached(
+                ("integrate", expr, var),
+                lambda: sp.N(sp.integrate(_cached_parse(expr), _sym(var))))
+
+        def done(result, error):
+            if error is not None:
+                self.expression = "Error"
+            else:
+                self.add_history(f"∫({expr}) d{var} = {result}")
+                self.expression = str(result)
+            self._update_display()
+
+        self._run_symbolic(self.int_button, compute, done)
+
+    def solve_equation(self):
+        var = "x"
+        expr = self.expression
+
+        def compute():
+            _load_heavy()
+            return self._symbolic_cached(
+                ("solve", expr, var),
+                functools.partial(self._solve_equation_impl, expr))
+
+        def done(solutions, error):
+            if error is not None:
+                self.expression = "Error"
+            else:
+                self.add_history(f"Solve({expr}) = {solutions}")
+                self.expression = str(solutions)
+            self._update_display()
+
+        self._run_symbolic(self.solve_button, compute, done)
+
+    def _solve_ode_impl(self, expr):
+        _load_heavy()
+        # Define symbols and function for ODE solving.
+        x = _sym("x")
+        y = sp.Function("y")
+        # Clean and prepare the input.
+        ode_input = expr.strip()
+        # Replace any form of "dy/dx" (ignoring spaces) with the proper derivative notation.
+        ode_input = _DY_DX_RE.sub("Derivative(y(x), x)", ode_input)
+        # Split the equation at the first "=" sign.
+        match = _EQ_SPLIT_RE.match(ode_input)
+        if match:
+            lhs = match.group(1).strip()
+            rhs = match.group(2).strip()
+            # Replace bare 'y' with 'y(x)' in the right-hand side.
+            rhs = _Y_BARE_RE.sub("y(x)", rhs)
+            local_key = (("x", x), ("y", y), ("Derivative", sp.Derivative))
+            lhs_expr = _cached_parse(lhs, local_key)
+            rhs_expr = _cached_parse(rhs, local_key)
+            ode_sym = sp.Eq(lhs_expr, rhs_expr)
+        else:
+            # If no '=' is found, assume the expression equals zero.
+            local_key = (("x", x), ("y", y), ("Derivative", sp.Derivative))
+            ode_expr = _cached_parse(ode_input, local_key)
+            ode_sym = sp.Eq(ode_expr, 0)
+        return sp.dsolve(ode_sym)
+
+    def solve_ode(self):
+        expr = self.expression
+
+        def done(sol, error):
+            if error is not None:
+                self.expression = "Error: " + str(error)
+            else:
+                self.add_history(f"Solve ODE({expr}) = {sol}")
+                self.expression = str(sol.rhs) if hasattr(sol, "rhs") else str(sol)
+            self._update_display()
+
+        self._run_symbolic(self.ode_button,
+                           functools.partial(self._solve_ode_impl, expr), done)
+
+    def fourier_transform(self):
+        # Compute the Fourier transform of the given expression with respect to x
+        expr = self.expression
+
+        def compute():
+            _load_heavy()
+            return self._symbolic_cached(
+                ("fourier", expr, "x"),
+                lambda: sp.fourier_transform(_cached_parse(expr),
+                                             _sym("x"), _sym("w")))
+
+        def done(ft, error):
+            if error is not None:
+                self.expression = "Error"
+            else:
+                self.add_history(f"Fourier({expr}) = {ft}")
+                self.expression = str(ft)
+            self._update_display()
+
+        self._run_symbolic(self.fourier_button, compute, done)
+
+    def latex_render(self):
+        _load_heavy()
+        # Render the current expression as LaTeX in a pop-up window.
+        try:
+            expr_sym = _cached_parse(self.expression)
+            latex_str = sp.latex(expr_sym)
+        except Exception:
+            latex_str = "Error"
+        latex_window = ctk.CTkToplevel(self)
+        latex_window.title("LaTeX Render")
+        latex_window.geometry("600x200")
+        label = ctk.CTkLabel(latex_window, text=latex_str, font=("Arial", 16), wraplength=580)
+        label.pack(padx=10, pady=10)
+        self.add_history(f"LaTeX Render: {latex_str}")
+
+    def matrix_operations(self):
+        _load_heavy()
+        # Basic matrix operations: determinant and inverse.
+        try:
+            expr_sym = _cached_parse(self.expression)
+            det = expr_sym.det() if hasattr(expr_sym, "det") else "N/A"
+            inv = expr_sym.inv() if hasattr(expr_sym, "inv") else "N/A"
+            self.add_history(f"Matrix Det: {det}\nMatrix Inv: {inv}")
+            self.expression = f"Det: {det}"
+        except Exception:
+            self.expression = "Error"
+        self._update_display()
+
+    def memory_clear(self):
+        self.memory = 0
+        self.add_history("Memory Cleared")
+
+    def memory_recall(self):
+        self.expression += str(self.memory)
+        self._update_display()
+        self.add_history(f"Memory Recalled: {self.memory}")
+
+    def memory_add(self):
+        try:
+            _load_mpmath()
+            with mp.workdps(self._current_dps()):
+                value = float(eval(_compile(_mpy_form(self.expression)), {"__builtins__": None}, allowed_names))
+            self.memory += value
+            self.add_history(f"Memory Added: {value} -> {self.memory}")
+        except Exception:
+            self.add_history("Memory Add Error")
+
+    def memory_subtract(self):
+        try:
+            _load_mpmath()
+            with mp.workdps(self._current_dps()):
+                value = float(eval(_compile(_mpy_form(self.expression)), {"__builtins__": None}, allowed_names))
+            self.memory -= value
+            self.add_history(f"Memory Subtracted: {value} -> {self.memory}")
+        except Exception:
+            self.add_history("Memory Subtract Error")
+
+    def _key(self, key, event=None):
+        self.click(key)
+        return "break"
+
+    def graph_expression(self):
+        _load_heavy()
+        # The figure/canvas/line state is a singleton, so a second Graph
+        # press raises the existing window instead of stacking another
+        # Toplevel onto state the first window's close handler would tear down
+        if self._fig is not None:
+            self.graph_window.deiconify()
+            self.graph_window.lift()
+            self.graph_window.focus_force()
+            return
+        self.graph_window = ctk.CTkToplevel(self)
+        self.graph_window.title("Graph Options")
+        self.graph_window.attributes("-topmost", True)
+        self.graph_window.geometry("700x600")
+        domain_frame = ctk.CTkFrame(self.graph_window)
+        domain_frame.pack(padx=10, pady=10, fill="x")
+        x_min_label = ctk.CTkLabel(domain_frame, text="X min:")
+        x_min_label.grid(row=0, column=0, padx=5, pady=5)
+        self.x_min_entry = ctk.CTkEntry(domain_frame, width=80)
+        self.x_min_entry.grid(row=0, column=1, padx=5, pady=5)
+        self.x_min_entry.insert(0, "-10")
+        x_max_label = ctk.CTkLabel(domain_frame, text="X max:")
+        x_max_label.grid(row=0, column=2, padx=5, pady=5)
+        self.x_max_entry = ctk.CTkEntry(domain_frame, width=80)
+        self.x_max_entry.grid(row=0, column=3, padx=5, pady=5)
+        self.x_max_entry.insert(0, "10")
+        var_label = ctk.CTkLabel(domain_frame, text="Variable:")
+        var_label.grid(row=1, column=0, padx=5, pady=5)
+        self.var_entry = ctk.CTkEntry(domain_frame, width=80)
+        self.var_entry.grid(row=1, column=1, padx=5, pady=5)
+        self.var_entry.insert(0, "x")
+        add_func_button = ctk.CTkButton(domain_frame, text="Add Function", command=self.add_function_to_plot)
+        add_func_button.grid(row=1, column=2, padx=5, pady=5)
+        plot_button = ctk.CTkButton(domain_frame, text="Plot Graph", command=self.plot_graph)
+        plot_button.grid(row=1, column=3, padx=5, pady=5)
+
+        # Live replot while the user edits the domain, debounced so fast
+        # typing produces one redraw instead of one per keystroke
+        self._replot_after = None
+        self.x_min_entry.bind("<KeyRelease>", self._schedule_replot)
+        self.x_max_entry.bind("<KeyRelease>", self._schedule_replot)
+
+        self.func_list = ctk.CTkTextbox(self.graph_window, font=("Arial", 12))
+        self.func_list.pack(padx=10, pady=10, fill="x")
+        self.func_list.insert("0.0", "Functions to Plot:\n")
+        self.func_list.configure(state="disabled")
+        
+        self.graph_frame = ctk.CTkFrame(self.graph_window)
+        self.graph_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # One Figure/Canvas per graph window; replots update the axes in place
+        # instead of rebuilding the Agg backend and Tk widgets every click
+        self._fig, self._ax = plt.subplots(figsize=(6, 4), dpi=100)
+        self._canvas = FigureCanvasTkAgg(self._fig, master=self.graph_frame)
+        self._toolbar = NavigationToolbar2Tk(self._canvas, self.graph_frame)
+        self._toolbar.update()
+        self._canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._canvas.mpl_connect("draw_event", self._on_plot_draw)
+        self.graph_window.protocol("WM_DELETE_WINDOW", self._close_graph_window)
+
+    def _close_graph_window(self):
+        # Release the Figure from pyplot's global registry so closed graph
+        # windows don't leak figures, and drop any pending replot aimed at
+        # the now-dead canvas
+        if self._replot_after is not None:
+            self.after_cancel(self._replot_after)
+            self._replot_after = None
+        plt.close(self._fig)
+        self._fig = None
+        self._ax = None
+        self._canvas = None
+        self._lines = []
+        self._bg = None
+        self._plot_state = None
+        self.graph_window.destroy()
+
+    def _on_plot_draw(self, event):
+        # After every full draw, cache the clean axes background (the reused
+        # lines are animated, so they're excluded from it) and paint the
+        # lines on top. _blit_lines can then restore+blit instead of a full
+        # Agg render when only line data changed.
+        if self._ax is None:
+            return
+        self._bg = self._canvas.copy_from_bbox(self._ax.bbox)
+        for line in self._lines:
+            self._ax.draw_artist(line)
+
+    def _blit_lines(self):
+        self._canvas.restore_region(self._bg)
+        for line in self._lines:
+            self._ax.draw_artist(line)
+        self._canvas.blit(self._ax.bbox)
+
+    def _schedule_replot(self, event=None):
+        if self._replot_after is not None:
+            self.after_cancel(self._replot_after)
+        self._replot_after = self.after(150, self._do_replot)
+
+    def _do_replot(self):
+        self._replot_after = None
+        self.plot_graph()
+
+    def add_function_to_plot(self):
+        if self.expression.strip():
+            self.func_list.configure(state="normal")
+            self.func_list.insert("end", self.expression + "\n")
+            self.func_list.configure(state="disabled")
+            self.add_history(f"Added function for plotting: {self.expression}")
+    
+    def plot_graph(self):
+        if self._fig is None:
+            return  # graph window not open; nothing to draw on
+        try:
+            x_min = float(self.x_min_entry.get())
+            x_max = float(self.x_max_entry.get())
+        except Exception:
+            x_min, x_max = -10, 10
+        var = self.var_entry.get().strip() or "x"
+        funcs_text = self.func_list.get("1.0", "end").strip().splitlines()[1:]
+        all_funcs = []
+        if self.expression.strip():
+            all_funcs.append(self.expression)
+        for f_text in funcs_text:
+            if f_text.strip():
+                all_funcs.append(f_text.strip())
+        if not all_funcs:
+            return
+        ax = self._ax
+        colors = ["blue", "red", "green", "orange", "purple", "brown"]
+        expr_strs = [_mpy_form(s) for s in all_funcs]
+        state = (tuple(expr_strs), var)
+        if len(expr_strs) > 1 and state == self._plot_state and self._lines:
+            # Same functions, new domain: update the existing Line2D data in
+            # place and, when the view limits don't move, blit just the line
+            # pixels instead of a full figure render
+            try:
+                F, consts = _build_multi_callable(tuple(expr_strs), var)
+                x_vals = np.linspace(x_min, x_max, 400, dtype=np.float32)
+                rows = iter(np.asarray(F(x_vals), dtype=np.float32)
+                            .reshape(-1, x_vals.size)) if F is not None else iter(())
+                for idx, line in enumerate(self._lines):
+                    if idx in consts:
+                        line.set_data([x_min, x_max], [consts[idx]] * 2)
+                    else:
+                        line.set_data(x_vals, next(rows))
+                old_lims = (ax.get_xlim(), ax.get_ylim())
+                ax.relim()
+                ax.autoscale_view()
+                if (ax.get_xlim(), ax.get_ylim()) == old_lims and self._bg is not None:
+                    self._blit_lines()
+                else:
+                    self._canvas.draw_idle()
+                return
+            except Exception:
+                pass  # rebuild from scratch below
+        ax.cla()
+        self._lines = []
+        self._bg = None
+        self._plot_state = None
+        plotted = False
+        if len(expr_strs) > 1:
+            # Several functions: evaluate them all in one lambdified Matrix
+            # call over a shared grid, so numpy dispatches once and CSE can
+            # share subterms across the functions
+            try:
+                F, consts = _build_multi_callable(tuple(expr_strs), var)
+                # float32 is ample for a ~1000px-wide plot and halves the
+                # bytes moved per sample pass (doubling SIMD lanes to boot)
+                x_vals = np.linspace(x_min, x_max, 400, dtype=np.float32)
+                if F is not None:
+                    rows = iter(np.asarray(F(x_vals), dtype=np.float32)
+                                .reshape(-1, x_vals.size))
+                for idx, func_expr in enumerate(all_funcs):
+                    color = colors[idx % len(colors)]
+                    if idx in consts:
+                        line, = ax.plot([x_min, x_max], [consts[idx]] * 2,
+                                        color=color, label=func_expr)
+                    else:
+                        line, = ax.plot(x_vals, next(rows), color=color, label=func_expr)
+                    # animated: excluded from full draws so the cached
+                    # background stays clean for blitting
+                    line.set_animated(True)
+                    self._lines.append(line)
+                plotted = True
+                self._plot_state = state
+            except Exception:
+                ax.cla()  # fall back to the per-function path below
+                self._lines = []
+        if not plotted:
+            for idx, func_expr in enumerate(expr_strs):
+                try:
+                    f = _build_plot_callable(func_expr, var)
+                    if isinstance(f, float):  # constant expression
+                        x_vals, y_vals = [x_min, x_max], [f, f]
+                    else:
+                        x_vals, y_vals = _adaptive_sample(f, x_min, x_max)
+                    ax.plot(x_vals, y_vals, color=colors[idx % len(colors)],
+                            label=all_funcs[idx])
+                except Exception as e:
+                    self.add_history(f"Error plotting {all_funcs[idx]}: {e}")
+        ax.set_xlabel(var)
+        ax.set_ylabel("f(" + var + ")")
+        ax.grid(True)
+        ax.legend()
+        # draw_idle defers Agg rendering to the Tk idle loop so consecutive
+        # edits coalesce into one draw instead of blocking per replot
+        self._canvas.draw_idle()
+
+if __name__ == "__main__":
+    ctk.set_appearance_mode("Dark")
+    ctk.set_default_color_theme("blue")
+    app = AdvancedScientificCalculator()
+    app.mainloop()